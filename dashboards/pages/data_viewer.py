@@ -1,75 +1,457 @@
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import numpy as np
 import duckdb
+import os
+from contextlib import contextmanager
 from macrokit_datalake import config_utils
 import collections as c
 from typing import List, Optional
 import pprint
-import plotly.express as px
-from streamlit_plotly_events import plotly_events
 
-# Connect to DuckDB
 config = config_utils.load_config()
 db_path = config["database"]["path"]
-conn = duckdb.connect(db_path)
+
+# DuckDB session settings for the dashboard's read-only connection; the memory
+# limit comes from the same database.memory_limit setting the ingest uses
+DUCKDB_THREADS = os.cpu_count() or 1
+DUCKDB_MEMORY_LIMIT = config["database"].get("memory_limit", "4GB")
+
+
+@st.cache_resource
+def get_conn() -> duckdb.DuckDBPyConnection:
+    """Open one read-only DuckDB connection shared across reruns and sessions."""
+    conn = duckdb.connect(db_path, read_only=True)
+    conn.execute(f"PRAGMA threads={DUCKDB_THREADS}")
+    conn.execute(f"PRAGMA memory_limit='{DUCKDB_MEMORY_LIMIT}'")
+    return conn
+
+
+@contextmanager
+def get_cursor():
+    """Yield a cursor on the shared connection for the current thread.
+
+    Each Streamlit session runs on its own thread and a DuckDB connection is
+    not thread-safe, so queries go through a per-call cursor instead.
+    """
+    cursor = get_conn().cursor()
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_catalog() -> tuple:
+    """Load the schema -> tables mapping and each table's columns and types.
+
+    Returns:
+        Tuple of (table_data, table_columns, table_dtypes)
+    """
+    with get_cursor() as conn:
+        fetched_tables = conn.execute("SHOW ALL TABLES").fetchall()
+        table_info = {
+            f"{schema}.{table_name}": conn.execute(
+                f"PRAGMA table_info('{schema}.{table_name}')"
+            ).fetchall()
+            for _, schema, table_name, *_ in fetched_tables
+        }
+    pprint.pprint(fetched_tables)
+
+    # Process the tables fetched
+    # Dictionary to hold schema to table mapping
+    table_data = c.defaultdict(list)
+    for table in fetched_tables:
+        schema, table_name = table[1], table[2]
+        table_data[schema].append(table_name)
+    for key in table_data:
+        table_data[key].sort()
+    pprint.pprint(table_data)
+
+    # Dictionaries to hold columns and their DuckDB types
+    table_columns = {}
+    table_dtypes = {}
+    for schema in table_data:
+        for table_name in table_data[schema]:
+            full_table_name = f"{schema}.{table_name}"
+            columns_info = table_info[full_table_name]
+            columns = [col[1] for col in columns_info]
+            table_columns[full_table_name] = columns
+            table_dtypes[full_table_name] = {col[1]: col[2] for col in columns_info}
+    pprint.pprint(table_columns)
+
+    return dict(table_data), table_columns, table_dtypes
+
 
 # Load and process DuckDB tables
+table_data, table_columns, table_dtypes = load_catalog()
+
+# Plots with more rows than this are downsampled before being sent to Plotly
+DOWNSAMPLE_THRESHOLD = 5000
+
+# Text columns with at most this many distinct values are loaded as categories
+MAX_CATEGORIES = 1024
+
+# Matching rows sampled for the Raw Data tab unless the full table is requested
+PREVIEW_ROWS = 100_000
+
+# Rows of the filtered Arrow table converted to pandas for the Raw Data grid
+MAX_DISPLAY_ROWS = 10_000
+
+# Aggregation options mapped to DuckDB interval literals and aggregate functions
+AGG_INTERVALS = {
+    "Hour": "1 hour",
+    "Day": "1 day",
+    "Week": "1 week",
+    "Month": "1 month",
+    "Quarter": "3 months",
+    "Year": "1 year",
+}
+AGG_FUNCTIONS = {
+    "mean": "AVG",
+    "sum": "SUM",
+    "min": "MIN",
+    "max": "MAX",
+    "median": "MEDIAN",
+    "std": "STDDEV_SAMP",
+    "count": "COUNT",
+}
+
+DUCKDB_NUMERIC_TYPES = {
+    "TINYINT",
+    "SMALLINT",
+    "INTEGER",
+    "BIGINT",
+    "HUGEINT",
+    "UTINYINT",
+    "USMALLINT",
+    "UINTEGER",
+    "UBIGINT",
+    "FLOAT",
+    "REAL",
+    "DOUBLE",
+    "DECIMAL",
+}
+
+
+def is_numeric_type(col_type: str) -> bool:
+    """Check whether a DuckDB type string is numeric (e.g. DECIMAL(18,3))."""
+    return col_type.split("(")[0].upper() in DUCKDB_NUMERIC_TYPES
+
+
+def is_temporal_type(col_type: str) -> bool:
+    """Check whether a DuckDB type string is a DATE or TIMESTAMP variant."""
+    col_type = col_type.upper()
+    return col_type.startswith("DATE") or col_type.startswith("TIMESTAMP")
+
+
+def get_numeric_cols(table_name: str) -> List[str]:
+    """Return the numeric columns of a table from its recorded DuckDB types."""
+    return [
+        col
+        for col, col_type in table_dtypes[table_name].items()
+        if is_numeric_type(col_type)
+    ]
+
+
+def get_categorical_cols(table_name: str) -> List[str]:
+    """Return the text and ENUM columns of a table from its recorded DuckDB types."""
+    return [
+        col
+        for col, col_type in table_dtypes[table_name].items()
+        if col_type.upper() == "VARCHAR" or col_type.upper().startswith("ENUM")
+    ]
+
+
+def categorize_text_columns(table: pa.Table) -> pa.Table:
+    """Dictionary-encode low-cardinality text columns.
+
+    Dictionary arrays become the pandas category dtype on conversion.
+    """
+    for idx, field in enumerate(table.schema):
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            column = table.column(idx)
+            if pc.count_distinct(column).as_py() <= MAX_CATEGORIES:
+                table = table.set_column(idx, field.name, pc.dictionary_encode(column))
+    return table
+
+
+@st.cache_data
+def get_table_stats(table_name: str) -> dict:
+    """Compute every column's statistics in a single pass over the table.
+
+    Returns:
+        Dictionary mapping column name to (min, max, approximate distinct
+        count); min and max are only computed for numeric and temporal
+        columns and are None otherwise
+    """
+    col_types = table_dtypes[table_name]
+    select_exprs = []
+    for col, col_type in col_types.items():
+        if is_numeric_type(col_type) or is_temporal_type(col_type):
+            select_exprs += [f'MIN("{col}")', f'MAX("{col}")']
+        else:
+            select_exprs += ["NULL", "NULL"]
+        select_exprs.append(f'approx_count_distinct("{col}")')
+
+    with get_cursor() as cursor:
+        row = cursor.execute(
+            f"SELECT {', '.join(select_exprs)} FROM {table_name}"
+        ).fetchone()
+    return {col: row[3 * idx : 3 * idx + 3] for idx, col in enumerate(col_types)}
 
-fetched_tables = conn.execute("SHOW ALL TABLES").fetchall()
-pprint.pprint(fetched_tables)
-
-# Process the tables fetched
-# Dictionary to hold schema to table mapping
-table_data = c.defaultdict(list)
-for table in fetched_tables:
-    schema, table_name = table[1], table[2]
-    table_data[schema].append(table_name)
-for key in table_data:
-    table_data[key].sort()
-pprint.pprint(table_data)
-
-
-# Dictionary to hold columns
-table_columns = {}
-for schema in table_data:
-    for table_name in table_data[schema]:
-        full_table_name = f"{schema}.{table_name}"
-        columns_info = conn.execute(
-            f"PRAGMA table_info('{full_table_name}')"
+
+@st.cache_data
+def count_rows(table_name: str) -> int:
+    """Return the total row count of a table."""
+    with get_cursor() as cursor:
+        return cursor.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+
+
+@st.cache_data
+def distinct_values(table_name: str, col: str, limit: int = 21) -> list:
+    """Return up to `limit` distinct non-null values of a column."""
+    with get_cursor() as cursor:
+        rows = cursor.execute(
+            f'SELECT DISTINCT "{col}" FROM {table_name} '
+            f'WHERE "{col}" IS NOT NULL LIMIT {limit}'
         ).fetchall()
-        columns = [col[1] for col in columns_info]
-        table_columns[full_table_name] = columns
-pprint.pprint(table_columns)
+    return [row[0] for row in rows]
+
+
+def build_filter_query(
+    table_name: str, filters: dict, drop_nulls: bool = False
+) -> tuple:
+    """Build the filtered SELECT for the filter widgets' predicates.
+
+    All predicates, including the optional "no nulls in any column" check, are
+    combined into one WHERE clause evaluated in a single pass.
+
+    Returns:
+        Tuple of (query, params)
+    """
+    clauses = []
+    params = []
+    for col, (filter_type, filter_val) in filters.items():
+        if filter_type == "numeric":
+            clauses.append(f'"{col}" BETWEEN ? AND ?')
+            params.extend([filter_val[0], filter_val[1]])
+        elif filter_type == "datetime":
+            clauses.append(f'"{col}" BETWEEN ?::TIMESTAMP AND ?::TIMESTAMP')
+            params.extend([filter_val[0], filter_val[1]])
+        elif filter_type == "categorical":
+            if filter_val:
+                placeholders = ", ".join("?" for _ in filter_val)
+                clauses.append(f'"{col}" IN ({placeholders})')
+                params.extend(filter_val)
+            else:
+                clauses.append("FALSE")
+    if drop_nulls:
+        clauses.append("COLUMNS(*) IS NOT NULL")
+
+    query = f"SELECT * FROM {table_name}"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    return query, params
 
 
-# Cached data loading function for a specific table
 @st.cache_data
-def load_data(table_name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
-    if not columns:
-        query = f"SELECT * FROM {table_name}"
-    else:
-        cols = ", ".join(columns)
-        query = f"SELECT {cols} FROM {table_name}"
-    return conn.execute(query).fetchdf()
+def count_filtered(table_name: str, filters: dict, drop_nulls: bool = False) -> int:
+    """Return how many rows match the filters."""
+    query, params = build_filter_query(table_name, filters, drop_nulls)
+    with get_cursor() as cursor:
+        return cursor.execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
 
 
-# Streamlit UI Header
-st.set_page_config(
-    page_title="Data Viewer",
-    layout="wide",
-    page_icon="📊",
-)
-st.title("Data Viewer")
+@st.cache_data
+def load_filtered(
+    table_name: str,
+    filters: dict,
+    drop_nulls: bool = False,
+    limit: Optional[int] = PREVIEW_ROWS,
+) -> pa.Table:
+    """Load a table with the filter widgets' predicates pushed into DuckDB.
+
+    When `limit` is set, a reservoir sample of at most that many matching rows
+    is returned; the sample is drawn after filtering.
+    """
+    query, params = build_filter_query(table_name, filters, drop_nulls)
+    if limit:
+        query = f"SELECT * FROM ({query}) USING SAMPLE {int(limit)} ROWS"
+    with get_cursor() as cursor:
+        table = cursor.execute(query, params).fetch_arrow_table()
+    return categorize_text_columns(table)
 
-# Streamlit UI Body
-selected_schema = st.selectbox("Select Schema", table_data.keys())
-selected_tablename = st.selectbox("Select Table", table_data[selected_schema])
-selected_table = f"{selected_schema}.{selected_tablename}"
 
-tab1, tab2 = st.tabs(["Raw Data", "Time Series Plot"])
-with tab1:
-    data = load_data(selected_table)
+@st.cache_data
+def is_parseable_date(table_name: str, col: str, sample_size: int = 100) -> bool:
+    """Check whether a text column holds dates by parsing a sample of its values."""
+    with get_cursor() as cursor:
+        sample = cursor.execute(
+            f'SELECT "{col}" FROM {table_name} WHERE "{col}" IS NOT NULL '
+            f"LIMIT {sample_size}"
+        ).fetchdf()[col]
+    try:
+        return bool(pd.to_datetime(sample, errors="coerce").notna().any())
+    except (TypeError, ValueError):
+        return False
+
+
+def aggregate_timeseries(
+    df: pd.DataFrame,
+    time_col: str,
+    value_cols: List[str],
+    freq: str,
+    method: str,
+    group_cols: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Bucket a time series by frequency and aggregate it with DuckDB.
+
+    Args:
+        df: Frame holding the time, value and grouping columns
+        time_col: Datetime column to bucket on
+        value_cols: Columns to aggregate
+        freq: Key of AGG_INTERVALS (e.g. "Month")
+        method: Key of AGG_FUNCTIONS (e.g. "mean")
+        group_cols: Extra columns to group by (color / facet splits)
+
+    Returns:
+        Aggregated frame sorted by time bucket
+    """
+    group_cols = group_cols or []
+    agg_func = AGG_FUNCTIONS[method]
+    bucket = f"time_bucket(INTERVAL '{AGG_INTERVALS[freq]}', \"{time_col}\")"
+    select_cols = [f'{bucket} AS "{time_col}"']
+    select_cols += [f'"{col}"' for col in group_cols]
+    select_cols += [f'{agg_func}("{col}") AS "{col}"' for col in value_cols]
+    group_by = ", ".join(str(i + 1) for i in range(len(group_cols) + 1))
+    query = f"""
+        SELECT {", ".join(select_cols)}
+        FROM plot_df
+        WHERE "{time_col}" IS NOT NULL
+        GROUP BY {group_by}
+        ORDER BY 1
+    """
+
+    with get_cursor() as cursor:
+        cursor.register("plot_df", df)
+        return cursor.execute(query).fetchdf()
+
+
+def downsample(
+    df: pd.DataFrame,
+    time_col: str,
+    value_cols: List[str],
+    group_cols: Optional[List[str]] = None,
+    n_out: int = 3000,
+) -> pd.DataFrame:
+    """Downsample a time series with M4 (first/last/min/max per bucket) in DuckDB.
+
+    Each trace (one per combination of `group_cols`) is split into equal-count
+    buckets ordered by time, and only the rows holding a bucket's first, last,
+    minimum or maximum value are kept, which preserves the shape of the line.
+    A bucket keeps at most one row per extreme, so the bucket count is sized
+    from the number of traces and value columns to return at most `n_out` rows.
+    """
+    if len(df) <= DOWNSAMPLE_THRESHOLD:
+        return df
+
+    group_cols = group_cols or []
+    n_traces = (
+        df.groupby(group_cols, observed=True, dropna=False, sort=False).ngroups
+        if group_cols
+        else 1
+    )
+    rows_per_bucket = 2 * (1 + len(value_cols))
+    n_buckets = max(1, n_out // (rows_per_bucket * n_traces))
+
+    partition = ", ".join(f'"{col}"' for col in group_cols)
+    partition_by = f"PARTITION BY {partition}" if partition else ""
+    bucket_by = f"PARTITION BY {partition + ', ' if partition else ''}_bucket"
+    # row_number() picks a single row per extreme, so ties can't inflate a bucket
+    extremes = " OR ".join(
+        f'row_number() OVER ({bucket_by} ORDER BY "{col}" {direction}) = 1'
+        for col in [time_col] + value_cols
+        for direction in ("ASC", "DESC")
+    )
+    query = f"""
+        WITH bucketed AS (
+            SELECT
+                *,
+                (row_number() OVER ({partition_by} ORDER BY "{time_col}") - 1)
+                    * ? // COUNT(*) OVER ({partition_by}) AS _bucket
+            FROM plot_df
+        )
+        SELECT * EXCLUDE (_bucket)
+        FROM bucketed
+        QUALIFY {extremes}
+        ORDER BY "{time_col}"
+    """
+
+    with get_cursor() as cursor:
+        cursor.register("plot_df", df)
+        return cursor.execute(query, [n_buckets]).fetchdf()
+
+
+@st.cache_data(show_spinner=False)
+def build_fig_json(
+    _plot_df: pd.DataFrame,
+    data_hash: int,
+    time_col: str,
+    value_cols: tuple,
+    color_by: Optional[str],
+    facet_by: Optional[str],
+) -> str:
+    """Build the time series figure and return it as Plotly JSON.
+
+    The frame itself is not hashed by Streamlit; `data_hash` stands in for its
+    content so reruns with unchanged data and options reuse the cached figure.
+    """
+    import plotly.express as px
+
+    fig = px.line(
+        _plot_df,
+        x=time_col,
+        y=list(value_cols),
+        color=color_by,
+        facet_col=facet_by,
+        title=f"Time Series: {', '.join(value_cols)}",
+        labels={time_col: "Time"},
+        template="plotly_white",
+        markers=True if len(_plot_df) < 100 else False,
+    )
+
+    # Update layout
+    fig.update_layout(
+        hovermode="x unified",
+        height=600,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+        ),
+    )
+    return fig.to_json()
+
+
+@st.cache_data(show_spinner=False)
+def figure_html(fig_json: str) -> str:
+    """Render a figure's JSON to HTML, cached by figure content.
+
+    plotly.js is loaded from the CDN instead of being embedded, which keeps the
+    file around 100 KB rather than several MB.
+    """
+    import plotly.io as pio
+
+    return pio.from_json(fig_json).to_html(include_plotlyjs="cdn")
+
+
+def render_tab1(selected_table: str) -> None:
+    """Render the Raw Data tab and hand its filtered rows to the plot tab."""
     st.write("### Raw Data")
 
     # Add filtering section
@@ -77,14 +459,24 @@ with tab1:
         filter_cols = st.columns(3)
         filters = {}
 
-        for idx, col in enumerate(data.columns):
+        col_types = table_dtypes[selected_table]
+        col_stats = get_table_stats(selected_table)
+
+        # Skip all-null and constant columns, which cannot narrow the data
+        filterable_cols = []
+        for col in table_columns[selected_table]:
+            col_min, col_max, approx_distinct = col_stats[col]
+            if approx_distinct > 1 and (col_min is None or col_min != col_max):
+                filterable_cols.append(col)
+
+        for idx, col in enumerate(filterable_cols):
             with filter_cols[idx % 3]:
-                if pd.api.types.is_numeric_dtype(data[col]):
-                    # Numeric filter - handle NaN
-                    non_null_data = data[col].dropna()
-                    if len(non_null_data) > 0:
-                        min_val = float(non_null_data.min())
-                        max_val = float(non_null_data.max())
+                if is_numeric_type(col_types[col]):
+                    # Numeric filter - bounds come from DuckDB, NULLs are ignored
+                    col_min, col_max, _ = col_stats[col]
+                    if col_min is not None:
+                        min_val = float(col_min)
+                        max_val = float(col_max)
 
                         selected_range = st.slider(
                             f"{col}",
@@ -95,13 +487,10 @@ with tab1:
                         )
                         filters[col] = ("numeric", selected_range)
 
-                elif pd.api.types.is_datetime64_any_dtype(data[col]):
-                    # Date filter - handle NaT
-                    non_null_data = data[col].dropna()
-                    if len(non_null_data) > 0:
-                        min_date = non_null_data.min()
-                        max_date = non_null_data.max()
-
+                elif is_temporal_type(col_types[col]):
+                    # Date filter - bounds come from DuckDB, NULLs are ignored
+                    min_date, max_date, _ = col_stats[col]
+                    if min_date is not None:
                         # Convert to python date objects, handling timezone-aware datetimes
                         if hasattr(min_date, "date"):
                             min_date = min_date.date()
@@ -115,7 +504,7 @@ with tab1:
 
                 else:
                     # Categorical filter - handle None/NaN
-                    unique_vals = data[col].dropna().unique().tolist()
+                    unique_vals = distinct_values(selected_table, col)
                     if len(unique_vals) <= 20 and len(unique_vals) > 0:
                         selected_vals = st.multiselect(
                             f"{col}",
@@ -125,91 +514,113 @@ with tab1:
                         )
                         filters[col] = ("categorical", selected_vals)
 
-    # Apply filters
-    filtered_data = data.copy()
-    for col, (filter_type, filter_val) in filters.items():
-        if filter_type == "numeric":
-            filtered_data = filtered_data[
-                (filtered_data[col].notna())
-                & (filtered_data[col] >= filter_val[0])
-                & (filtered_data[col] <= filter_val[1])
-            ]
-        elif filter_type == "datetime":
-            # Convert column to datetime if not already
-            if not pd.api.types.is_datetime64_any_dtype(filtered_data[col]):
-                filtered_data[col] = pd.to_datetime(filtered_data[col], errors="coerce")
-
-            # Filter out NaT and apply date range
-            filtered_data = filtered_data[
-                (filtered_data[col].notna())
-                & (filtered_data[col] >= pd.Timestamp(filter_val[0]))
-                & (filtered_data[col] <= pd.Timestamp(filter_val[1]))
-            ]
-        elif filter_type == "categorical":
-            filtered_data = filtered_data[
-                (filtered_data[col].notna()) & (filtered_data[col].isin(filter_val))
-            ]
-
-    st.write(f"Showing {len(filtered_data):,} of {len(data):,} rows")
-
     # Add option to include/exclude null values
     col_null1, col_null2 = st.columns([3, 1])
     with col_null2:
         show_nulls = st.checkbox("Show rows with nulls", value=True, key="show_nulls")
-
-    if not show_nulls:
-        filtered_data = filtered_data.dropna()
-        st.write(f"After removing nulls: {len(filtered_data):,} rows")
+        load_full = st.toggle("Load full table", value=False, key="load_full")
+
+    # Apply filters (and the null check) in DuckDB so only matching rows are
+    # fetched; unless the full table is requested the grid gets a sample
+    filtered_data = load_filtered(
+        selected_table,
+        filters,
+        drop_nulls=not show_nulls,
+        limit=None if load_full else PREVIEW_ROWS,
+    )
+    matching_rows = count_filtered(selected_table, filters, drop_nulls=not show_nulls)
+
+    with col_null1:
+        st.write(
+            f"Showing {matching_rows:,} of "
+            f"{count_rows(selected_table):,} rows"
+            + ("" if show_nulls else " (rows with nulls removed)")
+        )
+        if filtered_data.num_rows < matching_rows:
+            st.caption(
+                f"Table shows a random sample of {filtered_data.num_rows:,} "
+                "matching rows (the plot uses all of them); turn on "
+                "'Load full table' to load them all"
+            )
+
+    # Only the displayed slice is converted from Arrow to pandas; a full load
+    # shows (and allows selecting) every matching row
+    display_rows = filtered_data.num_rows if load_full else MAX_DISPLAY_ROWS
+    if filtered_data.num_rows > display_rows:
+        st.caption(f"Displaying the first {display_rows:,} rows")
+    display_data = filtered_data.slice(0, display_rows).to_pandas(
+        types_mapper=pd.ArrowDtype
+    )
 
     # Display dataframe with selection enabled
     selection = st.dataframe(
-        filtered_data,
+        display_data,
         use_container_width=True,
         selection_mode="multi-row",
         on_select="rerun",
         key="data_table",
     )
 
-    # Store filtered data and selection in session state for use in tab2
+    # Store the filters, the grid's rows and the selection for use in tab2; the
+    # plot reloads every matching row rather than reusing the sampled grid
+    st.session_state["filter_spec"] = {
+        "table": selected_table,
+        "filters": filters,
+        "drop_nulls": not show_nulls,
+    }
     st.session_state["filtered_data"] = filtered_data
     st.session_state["selected_rows"] = (
         selection.selection.rows if selection.selection else []
     )
 
-with tab2:
-    st.write("### Time Series Plot")
 
-    # Get data from session state (filtered data from tab1)
-    if "filtered_data" not in st.session_state:
-        data = load_data(selected_table)
-        st.session_state["filtered_data"] = data
-    else:
-        data = st.session_state["filtered_data"]
+@st.fragment
+def render_tab2(selected_table: str) -> None:
+    """Render the Time Series Plot tab.
+
+    Runs as a fragment so plot, aggregation and export widgets only rerun this
+    tab; the Raw Data tab stays in the full script run because this tab reads
+    its filters and row selection from session state.
+    """
+    # Plotting libraries are heavy to import, so they are only loaded here
+    import plotly.express as px
+    import plotly.io as pio
+    from streamlit_plotly_events import plotly_events
 
-    # Check if user selected specific rows
+    st.write("### Time Series Plot")
+
+    # Selected rows index into the Raw Data grid; otherwise plot every row
+    # matching tab1's filters, not the grid's sample
     selected_rows = st.session_state.get("selected_rows", [])
-    if selected_rows:
-        data = data.iloc[selected_rows]
+    filter_spec = st.session_state.get("filter_spec", {})
+    if selected_rows and "filtered_data" in st.session_state:
+        data = st.session_state["filtered_data"].take(selected_rows)
         st.info(f"📊 Plotting {len(selected_rows)} selected rows from Raw Data tab")
+    elif filter_spec.get("table") == selected_table:
+        data = load_filtered(
+            selected_table,
+            filter_spec["filters"],
+            drop_nulls=filter_spec["drop_nulls"],
+            limit=None,
+        )
+    else:
+        data = load_filtered(selected_table, {}, drop_nulls=False, limit=None)
 
-    if data.empty:
+    if data.num_rows == 0:
         st.warning("No data available to plot")
     else:
         # Identify potential date/time columns (exclude those with all NaT)
+        col_types = table_dtypes[selected_table]
         date_columns = []
-        for col in data.columns:
-            if pd.api.types.is_datetime64_any_dtype(data[col]):
-                if data[col].notna().any():  # Check if there are any non-NaT values
+        for col in data.column_names:
+            col_type = col_types.get(col, "")
+            if is_temporal_type(col_type):
+                # Check if there are any non-NaT values
+                if data.column(col).null_count < data.num_rows:
+                    date_columns.append(col)
+            elif col_type.upper() == "VARCHAR":
+                if is_parseable_date(selected_table, col):
                     date_columns.append(col)
-            elif data[col].dtype == "object":
-                try:
-                    parsed = pd.to_datetime(data[col], errors="coerce")
-                    if (
-                        parsed.notna().any()
-                    ):  # Check if parsing succeeded for any values
-                        date_columns.append(col)
-                except:
-                    pass
 
         if not date_columns:
             st.warning("No date/time columns detected in this table")
@@ -223,7 +634,7 @@ with tab2:
                 )
 
             with col2:
-                numeric_cols = data.select_dtypes(include=[np.number]).columns.tolist()
+                numeric_cols = get_numeric_cols(selected_table)
 
                 value_cols = st.multiselect(
                     "Select Value Column(s) to Plot",
@@ -235,29 +646,37 @@ with tab2:
             if not value_cols:
                 st.info("Please select at least one value column to plot")
             else:
-                # Convert time column to datetime and remove NaT values
-                plot_data = data.copy()
-                plot_data[time_col] = pd.to_datetime(
-                    plot_data[time_col], errors="coerce"
+                # Optional: Group by for categorical splits
+                categorical_cols = [
+                    col
+                    for col in get_categorical_cols(selected_table)
+                    if col != time_col
+                ]
+
+                # Convert only the columns the plot can use from Arrow to pandas
+                plot_cols = list(
+                    dict.fromkeys([time_col] + value_cols + categorical_cols)
+                )
+                frame = data.select(plot_cols).to_pandas(date_as_object=False)
+
+                # Convert time column to datetime (DATE/TIMESTAMP columns already
+                # are), then drop NaT rows and sort by time with one positional
+                # index so the frame is sliced once instead of masked and sorted
+                time_values = frame[time_col]
+                if not pd.api.types.is_datetime64_any_dtype(time_values):
+                    time_values = pd.to_datetime(time_values, errors="coerce")
+                valid_idx = np.flatnonzero(time_values.notna().to_numpy())
+                # Stable mergesort is fast on the mostly pre-sorted time columns
+                sorted_idx = valid_idx[
+                    time_values.iloc[valid_idx].argsort(kind="mergesort").to_numpy()
+                ]
+                plot_data = frame.iloc[sorted_idx].assign(
+                    **{time_col: time_values.iloc[sorted_idx]}
                 )
-
-                # Remove rows where time column is NaT
-                plot_data = plot_data[plot_data[time_col].notna()]
 
                 if plot_data.empty:
                     st.warning(f"No valid datetime values found in column '{time_col}'")
                 else:
-                    # Sort by time
-                    plot_data = plot_data.sort_values(time_col)
-
-                    # Optional: Group by for categorical splits
-                    categorical_cols = data.select_dtypes(
-                        include=["object", "category"]
-                    ).columns.tolist()
-                    categorical_cols = [
-                        col for col in categorical_cols if col != time_col
-                    ]
-
                     color_by = None
                     facet_by = None
 
@@ -282,32 +701,28 @@ with tab2:
                             if facet_by == "None":
                                 facet_by = None
 
-                    # Create the plot
-                    try:
-                        fig = px.line(
-                            plot_data,
-                            x=time_col,
-                            y=value_cols,
-                            color=color_by,
-                            facet_col=facet_by,
-                            title=f"Time Series: {', '.join(value_cols)}",
-                            labels={time_col: "Time"},
-                            template="plotly_white",
-                            markers=True if len(plot_data) < 100 else False,
+                    # Downsample large series so Plotly only draws what is visible
+                    group_cols = [col for col in (color_by, facet_by) if col]
+                    plot_df = downsample(plot_data, time_col, value_cols, group_cols)
+                    if len(plot_df) < len(plot_data):
+                        st.caption(
+                            f"Downsampled {len(plot_data):,} rows to "
+                            f"{len(plot_df):,} points"
                         )
 
-                        # Update layout
-                        fig.update_layout(
-                            hovermode="x unified",
-                            height=600,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1,
+                    # Create the plot
+                    try:
+                        fig_json = build_fig_json(
+                            plot_df,
+                            data_hash=int(
+                                pd.util.hash_pandas_object(plot_df, index=False).sum()
                             ),
+                            time_col=time_col,
+                            value_cols=tuple(value_cols),
+                            color_by=color_by,
+                            facet_by=facet_by,
                         )
+                        fig = pio.from_json(fig_json)
 
                         # Make the plot interactive with click events
                         selected_points = plotly_events(
@@ -323,16 +738,13 @@ with tab2:
                         if selected_points:
                             st.write("### Clicked Point Details")
                             clicked_idx = selected_points[0]["pointIndex"]
-                            clicked_data = plot_data.iloc[clicked_idx]
+                            clicked_data = plot_df.iloc[clicked_idx]
 
                             # Show details in a clean format
-                            detail_df = pd.DataFrame(
-                                {
-                                    "Column": clicked_data.index,
-                                    "Value": clicked_data.values,
-                                }
+                            st.dataframe(
+                                clicked_data.rename("Value").to_frame(),
+                                use_container_width=True,
                             )
-                            st.dataframe(detail_df, use_container_width=True)
 
                     except Exception as e:
                         st.error(f"Error creating plot: {str(e)}")
@@ -367,41 +779,23 @@ with tab2:
 
                         if agg_freq != "None":
                             try:
-                                # Perform aggregation
-                                freq_map = {
-                                    "Hour": "H",
-                                    "Day": "D",
-                                    "Week": "W",
-                                    "Month": "M",
-                                    "Quarter": "Q",
-                                    "Year": "Y",
-                                }
-
-                                agg_data = plot_data.set_index(time_col)
-
-                                if color_by:
-                                    agg_data = (
-                                        agg_data.groupby(
-                                            [
-                                                pd.Grouper(freq=freq_map[agg_freq]),
-                                                color_by,
-                                            ]
-                                        )[value_cols]
-                                        .agg(agg_method)
-                                        .reset_index()
-                                    )
-                                else:
-                                    agg_data = (
-                                        agg_data[value_cols]
-                                        .resample(freq_map[agg_freq])
-                                        .agg(agg_method)
-                                        .reset_index()
-                                    )
+                                # Perform aggregation in DuckDB
+                                agg_data = aggregate_timeseries(
+                                    plot_data,
+                                    time_col,
+                                    value_cols,
+                                    agg_freq,
+                                    agg_method,
+                                    group_cols,
+                                )
 
                                 # Remove any NaT rows that might have been created
                                 agg_data = agg_data[agg_data[time_col].notna()]
 
                                 if not agg_data.empty:
+                                    agg_data = downsample(
+                                        agg_data, time_col, value_cols, group_cols
+                                    )
                                     fig_agg = px.line(
                                         agg_data,
                                         x=time_col,
@@ -429,7 +823,14 @@ with tab2:
                         export_col1, export_col2 = st.columns(2)
 
                         with export_col1:
-                            csv = plot_data.to_csv(index=False)
+                            # Export every filtered column, not just the plotted
+                            # ones, in the same time order as the plot
+                            export_data = (
+                                data.take(sorted_idx)
+                                .to_pandas(date_as_object=False)
+                                .assign(**{time_col: plot_data[time_col].to_numpy()})
+                            )
+                            csv = export_data.to_csv(index=False)
                             st.download_button(
                                 "Download Filtered Data (CSV)",
                                 csv,
@@ -438,11 +839,39 @@ with tab2:
                             )
 
                         with export_col2:
-                            # Export plot as HTML
-                            html_buffer = fig.to_html()
-                            st.download_button(
-                                "Download Plot (HTML)",
-                                html_buffer,
-                                f"{selected_table}_plot.html",
-                                "text/html",
-                            )
+                            # Export plot as HTML, serialized only once requested;
+                            # the request is tied to this figure, so changing the
+                            # table or plot options asks for a new click
+                            fig_key = hash(fig_json)
+                            if st.button("Prepare Plot (HTML)", key="prepare_html"):
+                                st.session_state["html_fig_key"] = fig_key
+
+                            if st.session_state.get("html_fig_key") == fig_key:
+                                html_buffer = figure_html(fig_json)
+                                st.download_button(
+                                    "Download Plot (HTML)",
+                                    html_buffer,
+                                    f"{selected_table}_plot.html",
+                                    "text/html",
+                                )
+
+
+# Streamlit UI Header
+st.set_page_config(
+    page_title="Data Viewer",
+    layout="wide",
+    page_icon="📊",
+)
+st.title("Data Viewer")
+
+# Streamlit UI Body
+selected_schema = st.selectbox("Select Schema", table_data.keys())
+selected_tablename = st.selectbox("Select Table", table_data[selected_schema])
+selected_table = f"{selected_schema}.{selected_tablename}"
+
+tab1, tab2 = st.tabs(["Raw Data", "Time Series Plot"])
+with tab1:
+    render_tab1(selected_table)
+
+with tab2:
+    render_tab2(selected_table)
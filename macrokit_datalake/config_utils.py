@@ -1,12 +1,35 @@
+import os
 import yaml
+from functools import lru_cache
 from typing import Dict, Any
 
+try:
+    # libyaml-backed loader; much faster than the pure-Python SafeLoader
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+
+def load_yaml(stream) -> Any:
+    """Parse a YAML document with the fastest available safe loader.
+
+    Args:
+        stream: Open file or string holding the YAML document
+
+    Returns:
+        Parsed YAML content
+    """
+    return yaml.load(stream, Loader=_SafeLoader)
+
 
 def load_config(
     config_path: str = "macrokit_datalake/datalake_config.yaml",
 ) -> Dict[str, Any]:
     """Load configuration from YAML file.
 
+    Parsed configs are cached per file and re-read only when the file's
+    modification time changes, so the returned dict must not be mutated.
+
     Args:
         config_path: Path to the configuration YAML file
 
@@ -17,9 +40,20 @@ def load_config(
         FileNotFoundError: If config file doesn't exist
         yaml.YAMLError: If config file is malformed
     """
+    try:
+        mtime = os.path.getmtime(config_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+
+    return _load_config_cached(os.path.abspath(config_path), mtime)
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(config_path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a configuration file; cached on (path, mtime)."""
     try:
         with open(config_path, "r") as f:
-            return yaml.safe_load(f)
+            return load_yaml(f)
     except FileNotFoundError:
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     except yaml.YAMLError as e:
@@ -2,6 +2,7 @@
 
 from abc import ABC, abstractmethod
 from datetime import datetime
+import threading
 
 
 class BaseExtractor(ABC):
@@ -10,6 +11,7 @@ class BaseExtractor(ABC):
     def __init__(self, api_key=None):
         self.api_key = api_key
         self._client = None
+        self._client_lock = threading.Lock()
 
     @abstractmethod
     def connect(self):
@@ -23,7 +25,9 @@ class BaseExtractor(ABC):
 
     @property
     def client(self):
-        """Lazy load API client"""
+        """Lazy load API client (shared by all fetch threads)"""
         if self._client is None:
-            self._client = self.connect()
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self.connect()
         return self._client
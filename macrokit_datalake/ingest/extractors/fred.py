@@ -2,36 +2,164 @@ from fredapi import Fred
 from extractors.base import BaseExtractor
 from absl import logging
 import pandas as pd
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import re
+import xml.etree.ElementTree as ET
+from datetime import date
+from pathlib import Path
+
+# Keep-alive connections to api.stlouisfed.org; covers the processor fetch pool
+HTTP_POOL_SIZE = 16
+
+# Back off and retry when concurrent fetches trip FRED's rate limit or a 5xx
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    raise_on_status=False,
+)
+
+
+def _write_parquet(frame, path):
+    """Write a parquet cache file via a temp file swapped into place
+
+    An interrupted write can then never leave a truncated cache behind.
+    """
+    tmp_path = path.with_suffix(".parquet.tmp")
+    frame.to_parquet(tmp_path)
+    tmp_path.replace(path)
+
+
+class _SessionFred(Fred):
+    """Fred client that sends every request through one keep-alive session"""
+
+    def __init__(self, api_key, session):
+        super().__init__(api_key=api_key)
+        self._session = session
+
+    # fredapi fetches through a private, name-mangled urlopen helper that opens
+    # a new TCP/TLS connection per call; route it through the pooled session
+    def _Fred__fetch_data(self, url):
+        response = self._session.get(url + "&api_key=" + self.api_key)
+        if not response.ok:
+            try:
+                message = ET.fromstring(response.content).get("message")
+            except ET.ParseError:
+                response.raise_for_status()
+            raise ValueError(message)
+        return ET.fromstring(response.content)
 
 
 class FREDExtractor(BaseExtractor):
     """FRED API data extractor"""
 
+    def __init__(self, api_key=None, cache_dir=None):
+        super().__init__(api_key=api_key)
+        # Optional on-disk cache: full release histories (one file per day) and
+        # series histories (topped up incrementally)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
     def connect(self):
         """Initialize FRED client"""
         if not self.api_key:
             raise ValueError("FRED_API_KEY is required")
-        return Fred(api_key=self.api_key)
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=HTTP_RETRY,
+        )
+        session.mount("https://", adapter)
+        return _SessionFred(api_key=self.api_key, session=session)
 
     def get_data(self, series_id, start_date, end_date, **kwargs):
         """Get series data from FRED"""
-        return self.client.get_series(
-            series_id, observation_start=start_date, observation_end=end_date
-        )
+        if self.cache_dir is None:
+            return self.client.get_series(
+                series_id, observation_start=start_date, observation_end=end_date
+            )
+
+        series = self._get_cached_series(series_id)
+        return series[
+            (series.index >= pd.to_datetime(start_date))
+            & (series.index <= pd.to_datetime(end_date))
+        ]
+
+    def _get_cached_series(self, series_id):
+        """Full history of a series, topped up incrementally from the disk cache
+
+        Only observations from the last cached date onwards are downloaded, so
+        revisions to older (non-vintage) values are not picked up; clear the
+        cache directory to force a full refresh.
+        """
+        cache_path = self.cache_dir / f"fred_{series_id}.parquet"
+        cached = None
+        if cache_path.exists():
+            cached = pd.read_parquet(cache_path)["value"]
+
+        if cached is None or cached.empty:
+            series = self.client.get_series(series_id)
+        else:
+            last_date = cached.index.max()
+            # Re-fetch the last cached date too, in case it has been revised
+            new = self.client.get_series(series_id, observation_start=last_date)
+            logging.info(
+                "Using cached %s through %s, fetched %d observations from there",
+                series_id,
+                last_date.date(),
+                len(new),
+            )
+            series = pd.concat([cached[cached.index < last_date], new])
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_parquet(series.to_frame("value"), cache_path)
+        return series
+
+    def get_all_releases(self, series_id):
+        """Get every release of a series, reusing today's on-disk copy if cached"""
+        if self.cache_dir is None:
+            return self.client.get_series_all_releases(series_id)
+
+        prefix = f"alfred_{series_id}_"
+        today = date.today().isoformat()
+        cache_path = self.cache_dir / f"{prefix}{today}.parquet"
+        if cache_path.exists():
+            logging.info("Using cached releases for %s from %s", series_id, cache_path)
+            return pd.read_parquet(cache_path)
+
+        releases = self.client.get_series_all_releases(series_id)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_parquet(releases, cache_path)
+
+        # Only today's copy is ever read, so drop this series' earlier days
+        for stale_path in self.cache_dir.glob(f"{prefix}*.parquet"):
+            day = stale_path.name[len(prefix) : -len(".parquet")]
+            if day != today and re.fullmatch(r"\d{4}-\d{2}-\d{2}", day):
+                stale_path.unlink(missing_ok=True)
+        return releases
 
     def get_vintage_data(self, series_id, start_date=None, end_date=None, **kwargs):
         """Get all vintage data for a series"""
-        if not end_date:
-            series = self.client.get_series_all_releases(series_id)
-            series.index = pd.to_datetime(series.index)
-        else:
-            series = self.client.get_series_as_of_date(series_id, as_of_date=end_date)
-            series.index = pd.to_datetime(series.index)
-            end_date = pd.to_datetime(end_date)
-            series = series[series.index <= end_date]
+        # Parse the range bounds once
+        start_ts = pd.to_datetime(start_date) if start_date else None
+        end_ts = pd.to_datetime(end_date) if end_date else None
 
-        if start_date:
-            start_date = pd.to_datetime(start_date)
-            series = series[series.index >= start_date]
+        series = self.get_all_releases(series_id)
 
-        return series
+        # Releases carry a plain row index; observation dates are in "date"
+        dates = pd.to_datetime(series["date"])
+
+        # Build a single mask so the frame is sliced (and copied) only once
+        mask = np.ones(len(series), dtype=bool)
+        if end_ts is not None:
+            # Same as Fred.get_series_as_of_date, without a second download
+            mask &= (series["realtime_start"] <= end_ts).to_numpy()
+            mask &= (dates <= end_ts).to_numpy()
+        if start_ts is not None:
+            mask &= (dates >= start_ts).to_numpy()
+
+        return series[mask] if not mask.all() else series
@@ -1,10 +1,10 @@
 import duckdb
-import yaml
 from pathlib import Path
 from absl import logging
 from absl import app
 from absl import flags
 import shutil
+import csv
 from typing import Dict, List, Any, Optional
 import os
 from macrokit_datalake import config_utils
@@ -31,7 +31,7 @@ def get_enum_values_from_dbt(
     """
     try:
         with open(dbt_path, "r") as f:
-            dbt_config = yaml.safe_load(f)
+            dbt_config = config_utils.load_yaml(f)
 
         if "vars" not in dbt_config:
             raise KeyError("'vars' section not found in DBT project configuration")
@@ -112,6 +112,21 @@ def create_database(config: Dict[str, Any]) -> duckdb.DuckDBPyConnection:
     return conn
 
 
+def _sql_literal(value: Any) -> str:
+    """Render a value as a single-quoted SQL string literal.
+
+    DDL such as CREATE TYPE ... AS ENUM can't take bound parameters, so values
+    from the DBT config are escaped instead of interpolated raw.
+
+    Args:
+        value: Value to render
+
+    Returns:
+        Quoted literal with embedded single quotes doubled
+    """
+    return "'" + str(value).replace("'", "''") + "'"
+
+
 def create_enums(
     conn: duckdb.DuckDBPyConnection, enum_values: Dict[str, List[str]]
 ) -> None:
@@ -125,24 +140,30 @@ def create_enums(
         logging.warning("No enum values provided")
         return
 
+    # Scan the type catalog once rather than once per enum
+    rows = conn.execute("SELECT type_name FROM duckdb_types()").fetchall()
+    existing_types = {type_name for (type_name,) in rows}
+
+    create_stmts = {}
     for enum_name, values in enum_values.items():
         if not values:
             logging.warning(f"Skipping empty enum: {enum_name}")
             continue
 
-        # Check if enum already exists
-        result = conn.execute(
-            f"SELECT 1 FROM duckdb_types() WHERE type_name = '{enum_name}'"
-        ).fetchone()
-
-        if result:
+        if enum_name in existing_types:
             logging.info(f"Enum {enum_name} already exists, skipping")
             continue
 
-        values_str = ", ".join(f"'{v}'" for v in values)
-        create_stmt = f"CREATE TYPE {enum_name} AS ENUM ({values_str})"
-        conn.execute(create_stmt)
-        logging.info(f"Created enum: {enum_name} with values: {values}")
+        values_str = ", ".join(_sql_literal(v) for v in values)
+        create_stmts[enum_name] = f"CREATE TYPE {enum_name} AS ENUM ({values_str})"
+
+    if not create_stmts:
+        return
+
+    # Submit every CREATE TYPE in one round-trip
+    conn.execute(";\n".join(create_stmts.values()))
+    for enum_name in create_stmts:
+        logging.info(f"Created enum: {enum_name} with values: {enum_values[enum_name]}")
 
 
 def create_raw_schema(conn: duckdb.DuckDBPyConnection) -> None:
@@ -177,6 +198,7 @@ def create_tables_from_config(
         tables_config: List of table configurations
         table_prefix: Optional prefix for table names (e.g., "raw")
     """
+    statements = {}
     for table in tables_config:
         try:
             name = table["name"]
@@ -193,13 +215,28 @@ def create_tables_from_config(
                 col_type = col_def["type"]
             else:
                 col_type = col_def
-            columns.append(f"{col_name} {col_type}")
+            # Quote names so reserved words (e.g. "window") are valid columns
+            columns.append(f'"{col_name}" {col_type}')
 
         full_table_name = f"{table_prefix}.{name}" if table_prefix else name
-        create_stmt = (
-            f"CREATE TABLE IF NOT EXISTS {full_table_name} ({', '.join(columns)})"
-        )
+        column_defs = ", ".join(columns)
+        create_stmt = f"CREATE TABLE IF NOT EXISTS {full_table_name} ({column_defs})"
+        statements[full_table_name] = create_stmt
+
+    if not statements:
+        return
+
+    # Submit all DDL in one round-trip; if any statement fails, fall back to
+    # one table at a time so the rest still get created and errors are logged
+    try:
+        conn.execute(";\n".join(statements.values()))
+        for full_table_name in statements:
+            logging.info(f"Created table: {full_table_name}")
+        return
+    except Exception as e:
+        logging.warning(f"Batched table creation failed, retrying per table: {e}")
 
+    for full_table_name, create_stmt in statements.items():
         try:
             conn.execute(create_stmt)
             logging.info(f"Created table: {full_table_name}")
@@ -242,6 +279,7 @@ def create_metadata_table(
 
     # Insert raw table descriptions with temporal metadata
     if "raw_tables" in config:
+        rows = []
         for table in config["raw_tables"]:
             name = table["name"]
             description = table.get("description", "").strip()
@@ -254,14 +292,7 @@ def create_metadata_table(
             revision_end_col = table.get("revision_end_column")
             partition_cols = table.get("partition_by", [])
 
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO table_metadata 
-                (table_name, schema_name, description, table_type, 
-                 temporal_grain, primary_date_column, has_revisions, 
-                 revision_start_column, revision_end_column, partition_columns)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            rows.append(
                 (
                     name,
                     "raw",
@@ -273,26 +304,43 @@ def create_metadata_table(
                     revision_start_col,
                     revision_end_col,
                     partition_cols,
-                ),
+                )
             )
             logging.info(f"Added metadata for raw.{name} (grain={temporal_grain})")
 
+        # One prepared statement for every table instead of one execute per row
+        if rows:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO table_metadata 
+                (table_name, schema_name, description, table_type, 
+                 temporal_grain, primary_date_column, has_revisions, 
+                 revision_start_column, revision_end_column, partition_columns)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
+
     # Insert reference table descriptions
     if "reference_tables" in config:
+        rows = []
         for table in config["reference_tables"]:
             name = table["name"]
             description = table.get("description", "").strip()
             temporal_grain = table.get("temporal_grain", "STATIC")
 
-            conn.execute(
+            rows.append((name, "ref", description, "reference", temporal_grain))
+            logging.info(f"Added metadata for ref.{name} (grain={temporal_grain})")
+
+        if rows:
+            conn.executemany(
                 """
                 INSERT OR REPLACE INTO table_metadata 
                 (table_name, schema_name, description, table_type, temporal_grain)
                 VALUES (?, ?, ?, ?, ?)
             """,
-                (name, "ref", description, "reference", temporal_grain),
+                rows,
             )
-            logging.info(f"Added metadata for ref.{name} (grain={temporal_grain})")
 
 
 def create_column_metadata_table(
@@ -325,14 +373,17 @@ def create_column_metadata_table(
 
     # Populate from config - raw tables
     if "raw_tables" in config:
+        rows = []
         for table in config["raw_tables"]:
             table_name = table["name"]
             schema_name = "raw"
             schema = table.get("schema", {})
             primary_date_col = table.get("primary_date_column", "date")
-            revision_start_col = table.get("revision_start_column")
-            revision_end_col = table.get("revision_end_column")
-            partition_cols = table.get("partition_by", [])
+            revision_cols = {
+                table.get("revision_start_column"),
+                table.get("revision_end_column"),
+            } - {None}
+            partition_cols = set(table.get("partition_by", []))
 
             for col_name, col_def in schema.items():
                 if isinstance(col_def, dict):
@@ -343,17 +394,11 @@ def create_column_metadata_table(
                     col_desc = ""
 
                 is_primary_date = col_name == primary_date_col
-                is_revision = col_name in [revision_start_col, revision_end_col]
+                is_revision = col_name in revision_cols
                 is_system = col_name.startswith("_")
                 is_partition = col_name in partition_cols
 
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO column_metadata
-                    (table_name, schema_name, column_name, data_type, description, 
-                     is_primary_date, is_revision_timestamp, is_system_metadata, is_partition_key)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+                rows.append(
                     (
                         table_name,
                         schema_name,
@@ -364,15 +409,28 @@ def create_column_metadata_table(
                         is_revision,
                         is_system,
                         is_partition,
-                    ),
+                    )
                 )
 
             logging.info(
                 f"Added column metadata for raw.{table_name} ({len(schema)} columns)"
             )
 
+        # One prepared statement for every column instead of one execute per row
+        if rows:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO column_metadata
+                (table_name, schema_name, column_name, data_type, description, 
+                 is_primary_date, is_revision_timestamp, is_system_metadata, is_partition_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
     # Populate from config - reference tables
     if "reference_tables" in config:
+        rows = []
         for table in config["reference_tables"]:
             table_name = table["name"]
             schema_name = "ref"
@@ -388,19 +446,24 @@ def create_column_metadata_table(
 
                 is_system = col_name.startswith("_")
 
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO column_metadata
-                    (table_name, schema_name, column_name, data_type, description, is_system_metadata)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (table_name, schema_name, col_name, col_type, col_desc, is_system),
+                rows.append(
+                    (table_name, schema_name, col_name, col_type, col_desc, is_system)
                 )
 
             logging.info(
                 f"Added column metadata for ref.{table_name} ({len(schema)} columns)"
             )
 
+        if rows:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO column_metadata
+                (table_name, schema_name, column_name, data_type, description, is_system_metadata)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
 
 def load_reference_data_from_csv(
     conn: duckdb.DuckDBPyConnection, config: Dict[str, Any]
@@ -422,15 +485,36 @@ def load_reference_data_from_csv(
             "swap_conventions": "ref_swap_conventions.csv",
         }
 
+        table_columns = {
+            table["name"]: set(table.get("schema", {}))
+            for table in config.get("reference_tables", [])
+        }
+
+        # List the seeds directory once instead of stat-ing each file
+        try:
+            with os.scandir(seeds_path) as entries:
+                present = {entry.name for entry in entries if entry.is_file()}
+        except FileNotFoundError:
+            present = set()
+
         for table_name, csv_filename in csv_files.items():
             csv_path = seeds_path / csv_filename
-            if csv_path.exists():
+            if csv_filename in present:
                 try:
+                    # When the CSV header names are all table columns, map by
+                    # name so seeds may omit columns such as _loaded_at;
+                    # otherwise load positionally
+                    with open(csv_path, newline="") as f:
+                        header = next(csv.reader(f))
+                    column_list = ""
+                    if set(header) <= table_columns.get(table_name, set()):
+                        column_list = "(" + ", ".join(f'"{c}"' for c in header) + ") "
+
+                    # COPY parses straight into the table's column types, so
+                    # there is no type-sniffing pass over the file
                     conn.execute(
-                        f"""
-                        INSERT INTO ref.{table_name} 
-                        SELECT * FROM read_csv_auto('{csv_path}')
-                    """
+                        f"COPY ref.{table_name} {column_list}"
+                        f"FROM {_sql_literal(csv_path)} (HEADER true)"
                     )
                     logging.info(f"Loaded reference data from {csv_path}")
                 except Exception as e:
@@ -458,11 +542,14 @@ def generate_date_dimension(
     """
     logging.info(f"Generating date dimension from {start_date} to {end_date}")
 
+    # Single pass: calendar attributes and prior/next business day (running
+    # MAX/MIN windows over business dates) are computed in the same INSERT
     conn.execute(
         f"""
         INSERT INTO ref.date_dimension (
             date, year, quarter, month, day, day_of_week, day_name,
-            is_business_day, is_month_end, is_quarter_end, is_year_end
+            is_business_day, is_month_end, is_quarter_end, is_year_end,
+            prior_business_day, next_business_day
         )
         WITH date_series AS (
             SELECT 
@@ -472,48 +559,40 @@ def generate_date_dimension(
                 DATE '{end_date}',
                 INTERVAL '1 day'
             ) AS t(date)
-        )
-        SELECT 
-            date,
-            EXTRACT(YEAR FROM date)::INTEGER as year,
-            EXTRACT(QUARTER FROM date)::INTEGER as quarter,
-            EXTRACT(MONTH FROM date)::INTEGER as month,
-            EXTRACT(DAY FROM date)::INTEGER as day,
-            EXTRACT(ISODOW FROM date)::INTEGER as day_of_week,
-            CASE EXTRACT(ISODOW FROM date)
-                WHEN 1 THEN 'Monday'
-                WHEN 2 THEN 'Tuesday'
-                WHEN 3 THEN 'Wednesday'
-                WHEN 4 THEN 'Thursday'
-                WHEN 5 THEN 'Friday'
-                WHEN 6 THEN 'Saturday'
-                WHEN 7 THEN 'Sunday'
-            END as day_name,
-            -- Simple business day logic (Mon-Fri, no holidays yet)
-            EXTRACT(ISODOW FROM date) BETWEEN 1 AND 5 as is_business_day,
-            date = LAST_DAY(date) as is_month_end,
-            date = LAST_DAY(date) AND EXTRACT(MONTH FROM date) IN (3,6,9,12) as is_quarter_end,
-            EXTRACT(MONTH FROM date) = 12 AND EXTRACT(DAY FROM date) = 31 as is_year_end
-        FROM date_series
-    """
-    )
-
-    # Update prior/next business day columns
-    conn.execute(
-        """
-        UPDATE ref.date_dimension
-        SET prior_business_day = (
-            SELECT MAX(d2.date)
-            FROM ref.date_dimension d2
-            WHERE d2.is_business_day = TRUE
-              AND d2.date < date_dimension.date
         ),
-        next_business_day = (
-            SELECT MIN(d2.date)
-            FROM ref.date_dimension d2
-            WHERE d2.is_business_day = TRUE
-              AND d2.date > date_dimension.date
+        days AS (
+            SELECT 
+                date,
+                EXTRACT(YEAR FROM date)::INTEGER as year,
+                EXTRACT(QUARTER FROM date)::INTEGER as quarter,
+                EXTRACT(MONTH FROM date)::INTEGER as month,
+                EXTRACT(DAY FROM date)::INTEGER as day,
+                EXTRACT(ISODOW FROM date)::INTEGER as day_of_week,
+                CASE EXTRACT(ISODOW FROM date)
+                    WHEN 1 THEN 'Monday'
+                    WHEN 2 THEN 'Tuesday'
+                    WHEN 3 THEN 'Wednesday'
+                    WHEN 4 THEN 'Thursday'
+                    WHEN 5 THEN 'Friday'
+                    WHEN 6 THEN 'Saturday'
+                    WHEN 7 THEN 'Sunday'
+                END as day_name,
+                -- Simple business day logic (Mon-Fri, no holidays yet)
+                EXTRACT(ISODOW FROM date) BETWEEN 1 AND 5 as is_business_day,
+                date = LAST_DAY(date) as is_month_end,
+                date = LAST_DAY(date) AND EXTRACT(MONTH FROM date) IN (3,6,9,12) as is_quarter_end,
+                EXTRACT(MONTH FROM date) = 12 AND EXTRACT(DAY FROM date) = 31 as is_year_end
+            FROM date_series
         )
+        SELECT
+            *,
+            MAX(CASE WHEN is_business_day THEN date END) OVER (
+                ORDER BY date ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+            ) AS prior_business_day,
+            MIN(CASE WHEN is_business_day THEN date END) OVER (
+                ORDER BY date ROWS BETWEEN 1 FOLLOWING AND UNBOUNDED FOLLOWING
+            ) AS next_business_day
+        FROM days
     """
     )
 
@@ -559,26 +638,36 @@ def main(args: List[str]) -> None:
         # Create database
         conn = create_database(config)
 
-        # Get enums from DBT and create them
-        dbt_vars = get_enum_values_from_dbt()
-        enum_values = map_dbt_vars_to_enums(dbt_vars)
-        create_enums(conn, enum_values)
-
-        # Always create raw schema and tables
-        create_raw_schema(conn)
-        if "raw_tables" in config:
-            create_tables_from_config(conn, config["raw_tables"], "raw")
-
-        # Create reference tables
-        create_ref_schema(conn)
-        if "reference_tables" in config:
-            create_tables_from_config(conn, config["reference_tables"], "ref")
-
-        # Create metadata tables (table-level and column-level)
-        create_metadata_table(conn, config)
-        create_column_metadata_table(conn, config)
-
-        # Load reference data from CSV
+        # Create all types, schemas, tables and metadata in one transaction
+        # so the catalog is committed once rather than after every statement
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            # Get enums from DBT and create them
+            dbt_vars = get_enum_values_from_dbt()
+            enum_values = map_dbt_vars_to_enums(dbt_vars)
+            create_enums(conn, enum_values)
+
+            # Always create raw schema and tables
+            create_raw_schema(conn)
+            if "raw_tables" in config:
+                create_tables_from_config(conn, config["raw_tables"], "raw")
+
+            # Create reference tables
+            create_ref_schema(conn)
+            if "reference_tables" in config:
+                create_tables_from_config(conn, config["reference_tables"], "ref")
+
+            # Create metadata tables (table-level and column-level)
+            create_metadata_table(conn, config)
+            create_column_metadata_table(conn, config)
+        except Exception:
+            conn.execute("ROLLBACK")
+            conn.close()
+            raise
+        conn.execute("COMMIT")
+
+        # Load reference data from CSV (outside the transaction: a bad seed
+        # file is only warned about and must not abort the tables above)
         load_reference_data_from_csv(conn, config)
 
         # Generate date dimension
@@ -1,9 +1,20 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from absl import logging
 import os
 
+# Concurrent FRED requests per processor; keeps well under the API rate limit
+MAX_FETCH_WORKERS = 8
+
+# Series configuration CSVs live in the package's seeds directory
+SEEDS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "seeds"
+)
+
 
 class BaseProcessor(ABC):
     """Base class for all data processors"""
@@ -12,6 +23,8 @@ class BaseProcessor(ABC):
         self.extractor = extractor
         self.conn = conn
         self._series_config = None
+        self._last_dates = {}
+        self._loaded_at = None
 
     @abstractmethod
     def get_config_file_name(self):
@@ -31,13 +44,8 @@ class BaseProcessor(ABC):
     def get_series_config(self):
         """Load series configuration from CSV"""
         if self._series_config is None:
-            # Path to the seeds directory
             config_file = self.get_config_file_name()
-            seeds_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                "seeds",
-                config_file,
-            )
+            seeds_path = os.path.join(SEEDS_DIR, config_file)
 
             try:
                 df = pd.read_csv(seeds_path)
@@ -70,106 +78,195 @@ class BaseProcessor(ABC):
         Default implementation: assumes 'series_id' column exists and all other
         columns become the series_info dictionary.
         """
-        config = {}
-
         if "series_id" not in df.columns:
             logging.error("Configuration CSV must have 'series_id' column")
-            return config
-
-        for _, row in df.iterrows():
-            series_id = row["series_id"]
-            # Convert row to dict, excluding series_id
-            series_info = row.drop("series_id").to_dict()
-            config[series_id] = series_info
+            return {}
 
-        return config
+        # One columnar pass: series_id becomes the key, remaining columns the info
+        return df.set_index("series_id").to_dict(orient="index")
 
     def process(self, start_date, end_date, update_only=False, **kwargs):
-        """Main processing method - template pattern"""
+        """Main processing method - template pattern
+
+        Every series is inserted in one batch, so a failed insert writes nothing
+        to the table; it is logged and re-raised only when raise_on_error is set.
+        Inside the single ingestion transaction in raw.py, a failed insert also
+        aborts that transaction, so no table from the run is committed.
+        """
         series_config = self.get_series_config()
         table_name = self.get_table_name()
         logging.info(f"Processing {len(series_config)} series for {table_name}")
 
-        for series_id, series_info in series_config.items():
-            try:
-                self._process_series(
-                    series_id, series_info, start_date, end_date, update_only, **kwargs
+        # One load timestamp for every row written by this run
+        self._loaded_at = datetime.now()
+
+        # Look up the latest stored dates once for the whole run
+        self._last_dates = {}
+        if update_only and not kwargs.get("force_full", False):
+            self._last_dates = self._get_last_dates()
+
+        # Extraction is network-bound, so fetch all series concurrently and
+        # keep transform/insert on this thread (the connection isn't thread-safe)
+        max_workers = kwargs.get("max_workers", MAX_FETCH_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for series_id, series_info in series_config.items():
+                fetch_start = self._get_fetch_start(series_id, series_info, start_date)
+                if pd.Timestamp(fetch_start) > pd.Timestamp(end_date):
+                    continue  # already up to date, nothing to request
+                futures[series_id] = executor.submit(
+                    self._extract_data, series_id, fetch_start, end_date, **kwargs
                 )
+
+            # Pop each future as it is consumed so its raw download can be freed
+            # once transformed, rather than living until the batch is inserted
+            frames = []
+            for series_id, series_info in series_config.items():
+                future = futures.pop(series_id, None)
+                if future is None:
+                    logging.info("No new data for %s", series_id)
+                    continue
+                try:
+                    df = self._process_series(
+                        series_id,
+                        series_info,
+                        start_date,
+                        end_date,
+                        update_only,
+                        raw_data=future.result(),
+                        **kwargs,
+                    )
+                    if df is not None:
+                        frames.append(df)
+                except Exception as e:
+                    logging.error(f"Error processing {series_id}: {e}")
+                    if kwargs.get("raise_on_error", False):
+                        raise
+
+        # One INSERT for the whole processor instead of one per series
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+            try:
+                self._insert_data(df)
             except Exception as e:
-                logging.error(f"Error processing {series_id}: {e}")
+                logging.error(
+                    "%s failed to insert %d records into %s: %s",
+                    type(self).__name__,
+                    len(df),
+                    table_name,
+                    e,
+                )
                 if kwargs.get("raise_on_error", False):
                     raise
+                return
+            logging.info(f"✓ Inserted {len(df)} records into {table_name}")
 
     def _process_series(
         self, series_id, series_info, start_date, end_date, update_only, **kwargs
     ):
-        """Process a single series"""
-        # Extract data
-        raw_data = self._extract_data(series_id, start_date, end_date, **kwargs)
+        """Extract, transform and filter a single series.
+
+        Returns the DataFrame ready for insertion, or None if there is nothing
+        to insert. Inserting is left to process so all series land in one batch.
+
+        Transforms keep dates as datetime64 so update filters stay vectorized
+        (DuckDB casts them to DATE on insert), and need not sort or reset the
+        index: FRED returns observations in date order and process builds a
+        fresh index when it concatenates the batch.
+        """
+        # Extract data (unless it was already fetched by process)
+        if "raw_data" in kwargs:
+            raw_data = kwargs.pop("raw_data")
+        else:
+            raw_data = self._extract_data(series_id, start_date, end_date, **kwargs)
         if raw_data is None or len(raw_data) == 0:
-            logging.warning(f"No data extracted for {series_id}")
+            logging.warning("No data extracted for %s", series_id)
             return
-        logging.info("✓ Extracted data for {series_id}")
+        # Per-series messages use lazy %-formatting, so nothing is built when
+        # INFO is filtered out
+        logging.info("✓ Extracted data for %s", series_id)
 
         # Transform data
         df = self.transform_data(raw_data, series_info, series_id=series_id)
         if df is None or len(df) == 0:
-            logging.warning(f"No data after transformation for {series_id}")
+            logging.warning("No data after transformation for %s", series_id)
             return
-        logging.info(f"✓ Transformed data for {series_id}")
+        logging.info("✓ Transformed data for %s", series_id)
 
         # Filter for updates if needed
         if update_only and not kwargs.get("force_full", False):
             df = self._filter_for_updates(df, series_info)
             if len(df) == 0:
-                logging.info(f"No new data for {series_id}")
+                logging.info("No new data for %s", series_id)
                 return
-        logging.info(f"✓ Filtered data for updates for {series_id}")
+        logging.info("✓ Filtered data for updates for %s", series_id)
 
-        # Insert data
-        self._insert_data(df)
-        logging.info(f"✓ Inserted {len(df)} records for {series_id}")
+        return df
 
     def _extract_data(self, series_id, start_date, end_date, **kwargs):
         """Extract data using the extractor"""
         return self.extractor.get_data(series_id, start_date, end_date, **kwargs)
 
+    def _get_last_dates(self):
+        """Return the latest stored date per update key - can be overridden
+
+        Called once per process run in update mode; _filter_for_updates reads
+        the result from self._last_dates instead of querying per series.
+        """
+        return {}
+
+    def _get_last_date(self, series_id, series_info):
+        """Latest stored date for a series in update mode - can be overridden
+
+        Looks the series up in self._last_dates; None means fetch everything.
+        """
+        return None
+
+    def _get_fetch_start(self, series_id, series_info, start_date):
+        """Start of the fetch window for a series
+
+        In update mode FRED is asked only for observations after the latest
+        stored date, instead of downloading the full history to filter here.
+        """
+        last_date = self._get_last_date(series_id, series_info)
+        if last_date is None:
+            return start_date
+        next_date = pd.Timestamp(last_date) + pd.Timedelta(days=1)
+        return max(next_date, pd.Timestamp(start_date)).date().isoformat()
+
     def _filter_for_updates(self, df, series_info):
         """Filter data for incremental updates - can be overridden"""
         # Default implementation - override in subclasses for specific logic
-        # Ensure we have a clean index before returning
-        return df.reset_index(drop=True)
+        return df
 
     def _insert_data(self, df):
         """Insert data into database"""
         table_name = self.get_table_name()
 
-        # Ensure DataFrame has a clean integer index starting from 0
-        df = df.reset_index(drop=True)
-
-        # Use DuckDB's INSERT FROM VALUES with explicit column mapping
-        columns = list(df.columns)
-        column_str = ", ".join(columns)
-
-        # Convert DataFrame to list of tuples for insertion
-        values = [tuple(row) for row in df.itertuples(index=False, name=None)]
-
-        # Create placeholders for parameterized query
-        placeholder = "(" + ", ".join(["?" for _ in columns]) + ")"
-        values_str = ", ".join([placeholder for _ in range(len(values))])
-
-        query = f"INSERT INTO {table_name} ({column_str}) VALUES {values_str}"
-
-        # Flatten the values list for the parameterized query
-        flat_values = [item for sublist in values for item in sublist]
+        # Hand DuckDB an Arrow table (zero-copy scan, no object-dtype sniffing);
+        # string columns hold a handful of per-series values, so ship them as
+        # dictionaries
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for i, field in enumerate(table.schema):
+            if pa.types.is_string(field.type):
+                table = table.set_column(
+                    i, field.name, pc.dictionary_encode(table.column(i))
+                )
 
-        self.conn.execute(query, flat_values)
+        self.conn.register("_df_ingest", table)
+        try:
+            # BY NAME matches columns by name, so the frame's column order
+            # doesn't matter and table columns it lacks are left NULL
+            self.conn.execute(
+                f"INSERT INTO {table_name} BY NAME SELECT * FROM _df_ingest"
+            )
+        finally:
+            self.conn.unregister("_df_ingest")
 
     def add_common_columns(self, df, **kwargs):
         """Add common columns that most processors need"""
-        df["_loaded_at"] = datetime.now()
-        if "source" in kwargs:
-            df["source"] = kwargs["source"]
-        if "country" in kwargs:
-            df["country"] = kwargs["country"]
-        return df
+        columns = {"_loaded_at": self._loaded_at or datetime.now()}
+        for key in ("source", "country"):
+            if key in kwargs:
+                columns[key] = kwargs[key]
+        return df.assign(**columns)
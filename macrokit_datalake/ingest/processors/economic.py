@@ -17,18 +17,8 @@ class EconomicProcessor(BaseProcessor):
 
     def _parse_config_df(self, df):
         """Custom parsing for economic series configuration"""
-        config = {}
-
-        for _, row in df.iterrows():
-            config[row["series_id"]] = {
-                "indicator": row["indicator"],
-                "frequency": row["frequency"],
-                "unit": row["unit"],
-                "category": row["category"],
-                "subcategory": row["subcategory"],
-            }
-
-        return config
+        cols = ["indicator", "frequency", "unit", "category", "subcategory"]
+        return df.set_index("series_id")[cols].to_dict(orient="index")
 
     def _extract_data(self, series_id, start_date, end_date, **kwargs):
         """Override to get vintage data"""
@@ -50,23 +40,26 @@ class EconomicProcessor(BaseProcessor):
             logging.error("Raw data is not a pandas Series or DataFrame.")
             return None
 
-        logging.info(f"Retrieved {len(df_all)} total observations across all vintages")
+        logging.info("Retrieved %d total observations across all vintages", len(df_all))
 
-        # Assign series_id and indicator info
-        df_all["series_id"] = kwargs["series_id"]
-        df_all["indicator"] = series_info["indicator"]
-        df_all["unit"] = series_info["unit"]
-        df_all["category"] = series_info["category"]
-        df_all["subcategory"] = series_info["subcategory"]
-        df_all["frequency"] = series_info["frequency"]
+        # Assign series_id and indicator info in one pass
+        df_all = df_all.assign(
+            series_id=kwargs["series_id"],
+            indicator=series_info["indicator"],
+            unit=series_info["unit"],
+            category=series_info["category"],
+            subcategory=series_info["subcategory"],
+            frequency=series_info["frequency"],
+        )
 
-        # Rename and convert date columns
+        # Rename and convert date columns (kept as datetime64 rather than
+        # object-dtype dates; DuckDB casts to DATE on insert)
         df_all = df_all.rename(columns={"date": "observation_date"})
-        df_all["observation_date"] = pd.to_datetime(df_all["observation_date"]).dt.date
+        df_all["observation_date"] = pd.to_datetime(df_all["observation_date"])
 
         # Handle realtime_start column
         if "realtime_start" in df_all.columns:
-            df_all["realtime_start"] = pd.to_datetime(df_all["realtime_start"]).dt.date
+            df_all["realtime_start"] = pd.to_datetime(df_all["realtime_start"])
         else:
             df_all["realtime_start"] = df_all["observation_date"]
 
@@ -74,21 +67,20 @@ class EconomicProcessor(BaseProcessor):
         if "realtime_end" not in df_all.columns:
             df_all["realtime_end"] = df_all["realtime_start"]
         else:
-            df_all["realtime_end"] = pd.to_datetime(df_all["realtime_end"]).dt.date
-            mask = df_all["realtime_end"].isna()
-            df_all.loc[mask, "realtime_end"] = df_all.loc[mask, "realtime_start"]
+            df_all["realtime_end"] = pd.to_datetime(df_all["realtime_end"]).fillna(
+                df_all["realtime_start"]
+            )
 
         # Convert value column
         df_all["value"] = pd.to_numeric(df_all["value"], errors="coerce")
 
-        # Drop NaN values
-        df_all = df_all.dropna(subset=["value"])
-
-        if df_all.empty:
+        # Drop NaN values and select/order final columns in one take
+        keep = df_all["value"].notna().to_numpy()
+        if not keep.any():
             return None
 
-        # Select and order final columns
-        df = df_all[
+        df = df_all.loc[
+            keep,
             [
                 "series_id",
                 "category",
@@ -100,35 +92,31 @@ class EconomicProcessor(BaseProcessor):
                 "indicator",
                 "unit",
                 "frequency",
-            ]
+            ],
         ]
 
-        df = self.add_common_columns(df, source="FRED")
-
-        # Sort and reset index before returning
-        df = df.sort_values(by=["observation_date", "realtime_start"]).reset_index(
-            drop=True
-        )
-
-        return df
+        # No sort/reset here: DuckDB doesn't need ordered input, and process
+        # builds a fresh index when it concatenates the batch
+        return self.add_common_columns(df, source="FRED")
 
     def _process_series(
         self, series_id, series_info, start_date, end_date, update_only, **kwargs
     ):
         """Override to add economic-specific logging"""
-        logging.info(f"Fetching vintage data for {series_info['indicator']}...")
+        logging.info("Fetching vintage data for %s...", series_info["indicator"])
 
         # Call parent method
-        super()._process_series(
+        df = super()._process_series(
             series_id, series_info, start_date, end_date, update_only, **kwargs
         )
 
-        # Add economic-specific statistics logging
-        if hasattr(self, "_last_processed_df") and self._last_processed_df is not None:
-            df = self._last_processed_df
+        # Add economic-specific statistics logging (skipped entirely, groupby
+        # included, when INFO is disabled)
+        if df is not None and logging.level_info():
             num_observations = len(df)
             num_unique_dates = df["observation_date"].nunique()
-            num_vintages_per_date = df.groupby("observation_date")[
+            # Group order is irrelevant for a count, so skip sorting the keys
+            num_vintages_per_date = df.groupby("observation_date", sort=False)[
                 "realtime_start"
             ].nunique()
             num_revised = (num_vintages_per_date > 1).sum()
@@ -136,13 +124,12 @@ class EconomicProcessor(BaseProcessor):
                 num_observations / num_unique_dates if num_unique_dates > 0 else 0
             )
 
-            logging.info(f"  - {num_unique_dates} unique observation dates")
+            logging.info("  - %d unique observation dates", num_unique_dates)
             logging.info(
-                f"  - {num_revised} dates with revisions ({num_revised/num_unique_dates*100:.1f}%)"
+                "  - %d dates with revisions (%.1f%%)",
+                num_revised,
+                num_revised / num_unique_dates * 100,
             )
-            logging.info(f"  - {avg_vintages:.1f} avg vintages per date")
+            logging.info("  - %.1f avg vintages per date", avg_vintages)
 
-    def _insert_data(self, df):
-        """Override to store df for statistics and insert"""
-        self._last_processed_df = df
-        super()._insert_data(df)
+        return df
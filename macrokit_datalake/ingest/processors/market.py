@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 from datetime import datetime
 from processors.base import BaseProcessor
 from absl import logging
@@ -17,16 +18,12 @@ class MarketProcessor(BaseProcessor):
 
     def _parse_config_df(self, df):
         """Custom parsing for market data configuration"""
-        config = {}
+        # maturity is optional in the seed file
+        if "maturity" not in df.columns:
+            df = df.assign(maturity=None)
 
-        for _, row in df.iterrows():
-            config[row["series_id"]] = {
-                "indicator": row["indicator"],
-                "asset_class": row["asset_class"],
-                "maturity": row.get("maturity"),
-            }
-
-        return config
+        cols = ["indicator", "asset_class", "maturity"]
+        return df.set_index("series_id")[cols].to_dict(orient="index")
 
     def transform_data(self, raw_data, series_info, **kwargs):
         """Transform market data"""
@@ -36,26 +33,36 @@ class MarketProcessor(BaseProcessor):
         df = raw_data.reset_index()
         df.columns = ["date", "value"]
 
-        # Add series-specific info
-        df["series_id"] = kwargs["series_id"]
-        df["indicator"] = series_info["indicator"]
-        df["asset_class"] = series_info["asset_class"]
-        df["maturity"] = series_info.get("maturity")
+        # Add series-specific info in one pass
+        df = df.assign(
+            series_id=kwargs["series_id"],
+            indicator=series_info["indicator"],
+            asset_class=series_info["asset_class"],
+            maturity=series_info.get("maturity"),
+        )
 
         # Add common columns
         df = self.add_common_columns(df, source="FRED")
 
         # Type conversions
-        df["date"] = pd.to_datetime(df["date"]).dt.date
+        df["date"] = pd.to_datetime(df["date"])
         df["value"] = pd.to_numeric(df["value"], errors="coerce")
 
         # Drop NaN values
-        df = df.dropna(subset=["value"])
+        return df.dropna(subset=["value"])
+
+    def _get_last_dates(self):
+        """Latest stored date per series_id"""
+        return dict(
+            self.conn.execute(
+                f"SELECT series_id, MAX(date) FROM {self.get_table_name()} "
+                "GROUP BY series_id"
+            ).fetchall()
+        )
 
-        # Sort and reset index before returning
-        df = df.sort_values("date").reset_index(drop=True)
-
-        return df
+    def _get_last_date(self, series_id, series_info):
+        """Latest stored date for a series_id"""
+        return self._last_dates.get(series_id)
 
     def _filter_for_updates(self, df, series_info):
         """Filter for market data updates - by series_id"""
@@ -63,15 +70,11 @@ class MarketProcessor(BaseProcessor):
             return df
 
         series_id = df["series_id"].iloc[0]
-
-        last_date = self.conn.execute(
-            f"SELECT MAX(date) FROM {self.get_table_name()} WHERE series_id = ?",
-            [series_id],
-        ).fetchone()[0]
+        last_date = self._last_dates.get(series_id)
 
         if last_date:
-            df = df[df["date"] > last_date].reset_index(drop=True)
-            logging.info(f"Filtered to {len(df)} new observations after {last_date}")
+            df = df[df["date"].to_numpy() > np.datetime64(last_date)]
+            logging.info("Filtered to %d new observations after %s", len(df), last_date)
 
         return df
 
@@ -80,23 +83,23 @@ class MarketProcessor(BaseProcessor):
     ):
         """Override to add market-specific logging"""
         logging.info(
-            f"Fetching market data for {series_info['indicator']} ({series_info['asset_class']})..."
+            "Fetching market data for %s (%s)...",
+            series_info["indicator"],
+            series_info["asset_class"],
         )
 
-        super()._process_series(
+        df = super()._process_series(
             series_id, series_info, start_date, end_date, update_only, **kwargs
         )
 
-        if hasattr(self, "_last_processed_df") and self._last_processed_df is not None:
-            df = self._last_processed_df
-            logging.info(f"  - {len(df)} observations")
-            logging.info(f"  - Date range: {df['date'].min()} to {df['date'].max()}")
+        if df is not None and logging.level_info():
+            logging.info("  - %d observations", len(df))
+            logging.info("  - Date range: %s to %s", df["date"].min(), df["date"].max())
             if df["value"].notna().any():
                 logging.info(
-                    f"  - Value range: {df['value'].min():.2f} to {df['value'].max():.2f}"
+                    "  - Value range: %.2f to %.2f",
+                    df["value"].min(),
+                    df["value"].max(),
                 )
 
-    def _insert_data(self, df):
-        """Override to store df for statistics and insert"""
-        self._last_processed_df = df
-        super()._insert_data(df)
+        return df
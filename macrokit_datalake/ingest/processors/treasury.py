@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 from datetime import datetime
 from processors.base import BaseProcessor
 from absl import logging
@@ -17,16 +18,8 @@ class TreasuryYieldProcessor(BaseProcessor):
 
     def _parse_config_df(self, df):
         """Custom parsing for treasury yield configuration"""
-        config = {}
-
-        for _, row in df.iterrows():
-            config[row["series_id"]] = {
-                "indicator": row["indicator"],
-                "tenor": row["tenor"],
-                "curve_type": row["curve_type"],
-            }
-
-        return config
+        cols = ["indicator", "tenor", "curve_type"]
+        return df.set_index("series_id")[cols].to_dict(orient="index")
 
     def transform_data(self, raw_data, series_info, **kwargs):
         """Transform Treasury yield data for curve structure"""
@@ -36,14 +29,16 @@ class TreasuryYieldProcessor(BaseProcessor):
         df = raw_data.reset_index()
         df.columns = ["date", "yield"]
 
-        # Add series-specific info
-        df["series_id"] = kwargs["series_id"]
-        df["tenor"] = series_info["tenor"]
-        df["curve_type"] = series_info["curve_type"]
-        df["indicator"] = series_info["indicator"]
+        # Add series-specific info in one pass
+        df = df.assign(
+            series_id=kwargs["series_id"],
+            tenor=series_info["tenor"],
+            curve_type=series_info["curve_type"],
+            indicator=series_info["indicator"],
+        )
 
         # Type conversions first
-        df["date"] = pd.to_datetime(df["date"]).dt.date
+        df["date"] = pd.to_datetime(df["date"])
         df["yield"] = pd.to_numeric(df["yield"], errors="coerce")
 
         # Drop NaN yields and reset index immediately
@@ -60,12 +55,22 @@ class TreasuryYieldProcessor(BaseProcessor):
         df["ask"] = None
 
         # Add common columns
-        df = self.add_common_columns(df, source="FRED")
+        return self.add_common_columns(df, source="FRED")
 
-        # Final sort and return with fresh index
-        df = df.sort_values(["date", "tenor"]).reset_index(drop=True)
+    def _get_last_dates(self):
+        """Latest stored date per (tenor, curve_type)"""
+        rows = self.conn.execute(
+            f"""
+            SELECT tenor, curve_type, MAX(date)
+            FROM {self.get_table_name()}
+            GROUP BY tenor, curve_type
+            """
+        ).fetchall()
+        return {(tenor, curve_type): last for tenor, curve_type, last in rows}
 
-        return df
+    def _get_last_date(self, series_id, series_info):
+        """Latest stored date for the series' (tenor, curve_type)"""
+        return self._last_dates.get((series_info["tenor"], series_info["curve_type"]))
 
     def _filter_for_updates(self, df, series_info):
         """Filter for Treasury yield updates - by tenor and curve_type"""
@@ -75,20 +80,16 @@ class TreasuryYieldProcessor(BaseProcessor):
         # Use .iloc[0] for safe index access after potential filtering operations
         tenor = df["tenor"].iloc[0]
         curve_type = df["curve_type"].iloc[0]
-
-        last_date = self.conn.execute(
-            f"""
-            SELECT MAX(date) 
-            FROM {self.get_table_name()} 
-            WHERE tenor = ? AND curve_type = ?
-            """,
-            [tenor, curve_type],
-        ).fetchone()[0]
+        last_date = self._last_dates.get((tenor, curve_type))
 
         if last_date:
-            df = df[df["date"] > last_date].reset_index(drop=True)
+            df = df[df["date"].to_numpy() > np.datetime64(last_date)]
             logging.info(
-                f"Filtered to {len(df)} new observations after {last_date} for {tenor} {curve_type}"
+                "Filtered to %d new observations after %s for %s %s",
+                len(df),
+                last_date,
+                tenor,
+                curve_type,
             )
 
         return df
@@ -98,23 +99,23 @@ class TreasuryYieldProcessor(BaseProcessor):
     ):
         """Override to add Treasury-specific logging"""
         logging.info(
-            f"Fetching Treasury CMT for {series_info['tenor']} ({series_info['indicator']})..."
+            "Fetching Treasury CMT for %s (%s)...",
+            series_info["tenor"],
+            series_info["indicator"],
         )
 
-        super()._process_series(
+        df = super()._process_series(
             series_id, series_info, start_date, end_date, update_only, **kwargs
         )
 
-        if hasattr(self, "_last_processed_df") and self._last_processed_df is not None:
-            df = self._last_processed_df
-            logging.info(f"  - {len(df)} observations")
-            logging.info(f"  - Date range: {df['date'].min()} to {df['date'].max()}")
+        if df is not None and logging.level_info():
+            logging.info("  - %d observations", len(df))
+            logging.info("  - Date range: %s to %s", df["date"].min(), df["date"].max())
             if df["yield"].notna().any():
                 logging.info(
-                    f"  - Yield range: {df['yield'].min()*100:.2f}% to {df['yield'].max()*100:.2f}%"
+                    "  - Yield range: %.2f%% to %.2f%%",
+                    df["yield"].min() * 100,
+                    df["yield"].max() * 100,
                 )
 
-    def _insert_data(self, df):
-        """Override to store df for statistics and insert"""
-        self._last_processed_df = df
-        super()._insert_data(df)
+        return df
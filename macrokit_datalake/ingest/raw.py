@@ -2,19 +2,18 @@ import duckdb
 import os
 from dotenv import load_dotenv
 from absl import app, flags, logging
-import yaml
 
-# Import processors and extractors
-from extractors.fred import FREDExtractor
-from processors.market import MarketProcessor
-from processors.economic import EconomicProcessor
-from processors.treasury import TreasuryYieldProcessor
+# Extractor and processors (and the pandas stack behind them) are imported in
+# main, and each processor only when its table is requested, so --help and
+# single-table runs don't pay for unused imports
 
 # Utils
 from macrokit_datalake import config_utils
 
 FLAGS = flags.FLAGS
 
+DUCKDB_THREADS = os.cpu_count() or 1
+
 flags.DEFINE_boolean("overwrite", False, "Whether to overwrite existing data")
 flags.DEFINE_boolean("update_only", False, "Whether to only update existing data")
 flags.DEFINE_string(
@@ -28,13 +27,19 @@ flags.DEFINE_string(
 flags.DEFINE_string(
     "end_date", None, "End date for data fetch in YYYY-MM-DD format (default: today)"
 )
+flags.DEFINE_string(
+    "fred_cache_dir",
+    None,
+    "Directory for caching FRED downloads: vintages for the day, series "
+    "incrementally (default: no cache)",
+)
 
 load_dotenv()
 
 
 def get_date_range():
     """Get start and end dates based on flags"""
-    from datetime import datetime
+    from datetime import date
 
     if FLAGS.start_date:
         start_date = FLAGS.start_date
@@ -50,7 +55,7 @@ def get_date_range():
         end_date = FLAGS.end_date
         logging.info(f"Using explicit end date: {end_date}")
     else:
-        end_date = datetime.now().strftime("%Y-%m-%d")
+        end_date = date.today().isoformat()
         logging.info(f"End date: {end_date}")
 
     return start_date, end_date
@@ -67,6 +72,12 @@ def main(argv):
     # Connect to database
     db_path = config["database"]["path"]
     conn = duckdb.connect(db_path)
+    conn.execute(f"PRAGMA threads={DUCKDB_THREADS}")
+    memory_limit = config["database"].get("memory_limit")
+    if memory_limit:
+        conn.execute(f"PRAGMA memory_limit='{memory_limit}'")
+    # Raw tables have no ordering contract; lets DuckDB parallelize inserts
+    conn.execute("SET preserve_insertion_order = false")
 
     # Get FRED API key
     fred_api_key = os.getenv("FRED_API_KEY")
@@ -74,7 +85,9 @@ def main(argv):
         raise ValueError("FRED_API_KEY not found in .env file")
 
     # Initialize extractor
-    fred_extractor = FREDExtractor(api_key=fred_api_key)
+    from extractors.fred import FREDExtractor
+
+    fred_extractor = FREDExtractor(api_key=fred_api_key, cache_dir=FLAGS.fred_cache_dir)
 
     # Parse which tables to ingest
     tables_to_ingest = [table.strip().lower() for table in FLAGS.tables.split(",")]
@@ -85,29 +98,43 @@ def main(argv):
 
     logging.info("\nIngesting raw data into database...")
 
-    # Process market data
-    if ingest_all or "us_market_data" in tables_to_ingest:
-        logging.info("Ingesting market data...")
-        market_processor = MarketProcessor(fred_extractor, conn)
-        market_processor.process(
-            start_date=start_date, end_date=end_date, update_only=FLAGS.update_only
-        )
-
-    # Process treasury yields
-    if ingest_all or "us_treasury_yields" in tables_to_ingest:
-        logging.info("Ingesting treasury yields...")
-        treasury_processor = TreasuryYieldProcessor(fred_extractor, conn)
-        treasury_processor.process(
-            start_date=start_date, end_date=end_date, update_only=FLAGS.update_only
-        )
-
-    # Process economic indicators
-    if ingest_all or "us_economic_indicators" in tables_to_ingest:
-        logging.info("Ingesting economic indicators WITH VINTAGES...")
-        economic_processor = EconomicProcessor(fred_extractor, conn)
-        economic_processor.process(
-            start_date=start_date, end_date=end_date, update_only=FLAGS.update_only
-        )
+    # Ingest all tables in one transaction so the WAL is flushed once
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        # Process market data
+        if ingest_all or "us_market_data" in tables_to_ingest:
+            logging.info("Ingesting market data...")
+            from processors.market import MarketProcessor
+
+            market_processor = MarketProcessor(fred_extractor, conn)
+            market_processor.process(
+                start_date=start_date, end_date=end_date, update_only=FLAGS.update_only
+            )
+
+        # Process treasury yields
+        if ingest_all or "us_treasury_yields" in tables_to_ingest:
+            logging.info("Ingesting treasury yields...")
+            from processors.treasury import TreasuryYieldProcessor
+
+            treasury_processor = TreasuryYieldProcessor(fred_extractor, conn)
+            treasury_processor.process(
+                start_date=start_date, end_date=end_date, update_only=FLAGS.update_only
+            )
+
+        # Process economic indicators
+        if ingest_all or "us_economic_indicators" in tables_to_ingest:
+            logging.info("Ingesting economic indicators WITH VINTAGES...")
+            from processors.economic import EconomicProcessor
+
+            economic_processor = EconomicProcessor(fred_extractor, conn)
+            economic_processor.process(
+                start_date=start_date, end_date=end_date, update_only=FLAGS.update_only
+            )
+    except Exception:
+        conn.execute("ROLLBACK")
+        conn.close()
+        raise
+    conn.execute("COMMIT")
 
     # Close connection
     conn.close()